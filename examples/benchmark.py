@@ -25,8 +25,7 @@ def benchmark_pypath_based_fn():
         with open(f.name, "wb") as f:
             f.write(buffer)
 
-        with open(f.name, "rb") as f:
-            RustImage.load_from_buffer(f.read())
+        RustImage.load_from_path(f.name)
         print(f"size: {os.path.getsize(f.name) / 1024 / 1024:.1f}MB")
 
 
@@ -38,7 +37,8 @@ def benchmark_buffer_based_fn():
 
 
 def create_test_image():
-    pixels = np.random.rand(1024, 1024, 1).reshape(-1).astype(np.float32).copy()
+    # Generate float32 directly rather than downcasting a float64 array.
+    pixels = np.random.default_rng(0).random(1024 * 1024, dtype=np.float32)
     layer = RustLayer("test")
     layer.with_width(1024)
     layer.with_height(1024)
@@ -1,39 +1,89 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 import matplotlib.pyplot as plt
 import numpy as np
+import PIL.Image
 import PyOpenColorIO as OCIO
 from numpy.typing import NDArray
-from scipy.ndimage import zoom
 
 from exrio import Colorspace, ExrImage
 
 ACES_CONFIG = "ocio://studio-config-v2.2.0_aces-v1.3_ocio-v2.4"
-
-
-def apply_transform(processor: OCIO.Processor, pixels: NDArray[np.float32]):
+# Parsing the config is expensive, so every conversion shares this one instance.
+ACES_OCIO_CONFIG = OCIO.Config().CreateFromFile(ACES_CONFIG)
+PLOT_STRIDE = 4
+
+
+@lru_cache(maxsize=None)
+def get_cpu_processor(
+    from_transform: str,
+    to_transform: str,
+    view: Optional[str] = None,
+    direction: int = OCIO.TRANSFORM_DIR_FORWARD,
+) -> OCIO.CPUProcessor:
+    """Builds (once per transform) the finalized CPU processor for a conversion."""
+    if view is None:
+        processor = ACES_OCIO_CONFIG.getProcessor(from_transform, to_transform)
+    else:
+        processor = ACES_OCIO_CONFIG.getProcessor(
+            from_transform, to_transform, view, direction
+        )
+    return processor.getDefaultCPUProcessor()
+
+
+def apply_transform(cpu: OCIO.CPUProcessor, pixels: NDArray[np.float32]):
     if pixels.dtype.name != "float32":
         raise ValueError("Image must be float32 not " + pixels.dtype.name)
-    cpu = processor.getDefaultCPUProcessor()
+    if not pixels.flags.c_contiguous:
+        raise ValueError("Image must be C-contiguous to be transformed in-place")
     _, _, channels = pixels.shape
     if channels == 3:
-        cpu.applyRGB(pixels)
-    if channels == 4:
-        cpu.applyRGBA(pixels)
+        apply = cpu.applyRGB
+    elif channels == 4:
+        apply = cpu.applyRGBA
+    else:
+        return
+
+    # OCIO's CPU path is single-threaded but releases the GIL, so transform
+    # contiguous row strips of the image in parallel.
+    # Never split into more strips than there are rows, so no strip is empty.
+    strip_count = min(os.cpu_count() or 1, pixels.shape[0])
+    if strip_count == 0:
+        return
+    strips = np.array_split(pixels, strip_count, axis=0)
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(apply, strips))
+
+
+def round_trip(
+    pixels: NDArray[np.float32],
+    processor: OCIO.CPUProcessor,
+    reverse_processor: OCIO.CPUProcessor,
+) -> tuple[NDArray[np.float32], NDArray[np.float32]]:
+    """Applies a transform and its reverse to a single copy of the pixels each.
+
+    Returns:
+        The transformed pixels and the pixels transformed back to the source colorspace.
+    """
+    transformed = pixels.copy()
+    apply_transform(processor, transformed)
+
+    back_to_source = transformed.copy()
+    apply_transform(reverse_processor, back_to_source)
+    return transformed, back_to_source
 
 
 def convert_to_acescg(pixels: NDArray[np.float32], output_path: Path):
-    ocio_config = OCIO.Config().CreateFromFile(ACES_CONFIG)
     from_transform = "ACES2065-1"
     to_transform = "ACEScg"
 
-    acescg_pixels = pixels.copy()
-    processor = ocio_config.getProcessor(from_transform, to_transform)
-    apply_transform(processor, acescg_pixels)
-
-    back_to_aces = acescg_pixels.copy()
-    reverse_processor = ocio_config.getProcessor(to_transform, from_transform)
-    apply_transform(reverse_processor, back_to_aces)
+    processor = get_cpu_processor(from_transform, to_transform)
+    reverse_processor = get_cpu_processor(to_transform, from_transform)
+    acescg_pixels, back_to_aces = round_trip(pixels, processor, reverse_processor)
 
     acescg_image = ExrImage.from_pixels_ACEScg(acescg_pixels)
     acescg_image.to_path(output_path)
@@ -43,17 +93,12 @@ def convert_to_acescg(pixels: NDArray[np.float32], output_path: Path):
 
 
 def convert_to_acescct(pixels: NDArray[np.float32], output_path: Path):
-    ocio_config = OCIO.Config().CreateFromFile(ACES_CONFIG)
     from_transform = "ACES2065-1"
     to_transform = "ACEScct"
 
-    acescct_pixels = pixels.copy()
-    processor = ocio_config.getProcessor(from_transform, to_transform)
-    apply_transform(processor, acescct_pixels)
-
-    back_to_aces = acescct_pixels.copy()
-    reverse_processor = ocio_config.getProcessor(to_transform, from_transform)
-    apply_transform(reverse_processor, back_to_aces)
+    processor = get_cpu_processor(from_transform, to_transform)
+    reverse_processor = get_cpu_processor(to_transform, from_transform)
+    acescct_pixels, back_to_aces = round_trip(pixels, processor, reverse_processor)
 
     acescct_image = ExrImage.from_pixels_ACEScct(acescct_pixels)
     acescct_image.to_path(output_path)
@@ -63,17 +108,12 @@ def convert_to_acescct(pixels: NDArray[np.float32], output_path: Path):
 
 
 def convert_to_srgb(pixels: NDArray[np.float32], output_path: Path):
-    ocio_config = OCIO.Config().CreateFromFile(ACES_CONFIG)
     from_transform = "ACES2065-1"
     to_transform = "sRGB Encoded Rec.709 (sRGB)"
 
-    srgb_pixels = pixels.copy()
-    processor = ocio_config.getProcessor(from_transform, to_transform)
-    apply_transform(processor, srgb_pixels)
-
-    back_to_aces = srgb_pixels.copy()
-    reverse_processor = ocio_config.getProcessor(to_transform, from_transform)
-    apply_transform(reverse_processor, back_to_aces)
+    processor = get_cpu_processor(from_transform, to_transform)
+    reverse_processor = get_cpu_processor(to_transform, from_transform)
+    srgb_pixels, back_to_aces = round_trip(pixels, processor, reverse_processor)
 
     srgb_image = ExrImage.from_pixels(srgb_pixels)
     srgb_image.to_path(output_path)
@@ -83,22 +123,17 @@ def convert_to_srgb(pixels: NDArray[np.float32], output_path: Path):
 
 
 def convert_to_srgb_rrt(pixels: NDArray[np.float32], output_path: Path):
-    ocio_config = OCIO.Config().CreateFromFile(ACES_CONFIG)
     from_transform = "ACES2065-1"
     display = "sRGB - Display"
     view = "ACES 1.0 - SDR Video"
 
-    srgb_pixels = pixels.copy()
-    processor = ocio_config.getProcessor(
+    processor = get_cpu_processor(
         from_transform, display, view, OCIO.TRANSFORM_DIR_FORWARD
     )
-    apply_transform(processor, srgb_pixels)
-
-    back_to_aces = srgb_pixels.copy()
-    reverse_processor = ocio_config.getProcessor(
+    reverse_processor = get_cpu_processor(
         from_transform, display, view, OCIO.TRANSFORM_DIR_INVERSE
     )
-    apply_transform(reverse_processor, back_to_aces)
+    srgb_pixels, back_to_aces = round_trip(pixels, processor, reverse_processor)
 
     srgb_image = ExrImage.from_pixels(srgb_pixels)
     srgb_image.to_path(output_path)
@@ -108,17 +143,12 @@ def convert_to_srgb_rrt(pixels: NDArray[np.float32], output_path: Path):
 
 
 def convert_to_srgb_linear(pixels: NDArray[np.float32], output_path: Path):
-    ocio_config = OCIO.Config().CreateFromFile(ACES_CONFIG)
     from_transform = "ACES2065-1"
     to_transform = "Linear Rec.709 (sRGB)"
 
-    srgb_linear_pixels = pixels.copy()
-    processor = ocio_config.getProcessor(from_transform, to_transform)
-    apply_transform(processor, srgb_linear_pixels)
-
-    back_to_aces = srgb_linear_pixels.copy()
-    reverse_processor = ocio_config.getProcessor(to_transform, from_transform)
-    apply_transform(reverse_processor, back_to_aces)
+    processor = get_cpu_processor(from_transform, to_transform)
+    reverse_processor = get_cpu_processor(to_transform, from_transform)
+    srgb_linear_pixels, back_to_aces = round_trip(pixels, processor, reverse_processor)
 
     srgb_linear_image = ExrImage.from_pixels(srgb_linear_pixels)
     srgb_linear_image.to_path(output_path)
@@ -141,28 +171,29 @@ def plot_image_and_histogram(
     for idx, (transformed, reverse_transformed, label) in enumerate(images_and_labels):
         ax1, ax2, ax3 = axes[idx]
 
-        # Plot the transformed image
-        ax1.imshow(transformed)
+        # Plot the transformed image, subsampled since the figure can't show full resolution
+        ax1.imshow(transformed[::PLOT_STRIDE, ::PLOT_STRIDE])
         ax1.set_title(f"{label}")
         ax1.axis("off")
 
         # Plot the reverse-transformed image
-        ax2.imshow(reverse_transformed)
+        ax2.imshow(reverse_transformed[::PLOT_STRIDE, ::PLOT_STRIDE])
         ax2.set_title(f"{label} (Back to ACES)")
         ax2.axis("off")
 
         # Plot histograms for just the transformed image
         colors = ["red", "green", "blue"]
         for i, color in enumerate(colors):
-            # Transformed image histogram (solid lines)
-            ax3.hist(
-                transformed[:, :, i].ravel(),
-                bins=256,
-                range=(-0.1, 1),
+            # Transformed image histogram (solid lines), binned by NumPy and drawn once
+            counts, edges = np.histogram(
+                transformed[:, :, i], bins=256, range=(-0.1, 1)
+            )
+            ax3.stairs(
+                counts,
+                edges,
                 color=color,
                 alpha=0.5,
                 label=f"{color.upper()} transformed",
-                histtype="step",
                 linewidth=2,
             )
 
@@ -184,14 +215,28 @@ def write_thumbnail(image: ExrImage, original_path: Path, colorspace: Colorspace
         colorspace: The colorspace of the image ('ACEScg', 'ACEScct', or None for default)
     """
     pixels = image.to_pixels()[0]
-    # Ensure pixels are float32 before zooming
-    pixels = pixels.astype(np.float32)
+    # Ensure pixels are float32 before resizing
+    pixels = np.ascontiguousarray(pixels, dtype=np.float32)
 
     height, width, channels = pixels.shape
     zoom_y = 64.0 / height
     zoom_x = 64.0 / width
     min_zoom = min(zoom_y, zoom_x)
-    thumb_pixels = zoom(pixels, (min_zoom, min_zoom, 1), order=1)
+    thumb_width = max(1, int(width * min_zoom))
+    thumb_height = max(1, int(height * min_zoom))
+
+    # Box-filter each channel as a 32-bit float image, touching every source pixel once.
+    thumb_pixels = np.stack(
+        [
+            np.asarray(
+                PIL.Image.fromarray(pixels[..., i]).resize(
+                    (thumb_width, thumb_height), resample=PIL.Image.Resampling.BOX
+                )
+            )
+            for i in range(channels)
+        ],
+        axis=-1,
+    )
 
     thumb_image = ExrImage.from_pixels(thumb_pixels, colorspace)
     thumb_path = original_path.parent / (original_path.stem + ".thumb.exr")
@@ -203,7 +248,7 @@ def main():
     output_dir = Path(__file__).parent.parent / ".data" / "out"
     image_path = examples_dir / "ACES" / "DigitalLAD.2048x1556.exr"
     image = ExrImage.from_path(image_path)
-    pixels = image.to_pixels().astype(np.float32)[0]
+    pixels = image.to_pixels()[0].astype(np.float32, copy=False)
 
     output_dir.mkdir(parents=True, exist_ok=True)
     image.to_path(output_dir / "out_original.exr")
@@ -2,6 +2,7 @@ import json
 import re
 import traceback
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import numpy as np
@@ -12,6 +13,7 @@ from exrio import ExrChannel, ExrLayer, load
 
 EXAMPLES_ZIP_URL = "https://github.com/patrickhulce/exrio/releases/download/v0.0.2/examples-v20241230.zip"
 EXAMPLES_DATA_PATH = Path(__file__).parent.parent / ".data" / "examples-v20241230"
+UNSAFE_FILENAME_CHARS = re.compile(r"[^a-zA-Z0-9]+")
 
 
 def download_examples() -> None:
@@ -20,12 +22,14 @@ def download_examples() -> None:
         return
 
     print("Downloading examples...")
-    response = requests.get(EXAMPLES_ZIP_URL)
-    response.raise_for_status()
     EXAMPLES_DATA_PATH.parent.mkdir(parents=True, exist_ok=True)
     zip_path = EXAMPLES_DATA_PATH.with_suffix(".zip")
-    with open(zip_path, "wb") as file:
-        file.write(response.content)
+    # Stream to disk rather than holding the whole archive in memory.
+    with requests.get(EXAMPLES_ZIP_URL, stream=True) as response:
+        response.raise_for_status()
+        with open(zip_path, "wb") as file:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                file.write(chunk)
 
     print("Extracting examples...")
     with zipfile.ZipFile(zip_path, "r") as zip_ref:
@@ -34,33 +38,78 @@ def download_examples() -> None:
     print("Examples downloaded and extracted.")
 
 
+def build_linear_to_srgb_lut() -> np.ndarray:
+    """Maps every float16 bit pattern to its 8-bit display value."""
+    half_values = np.arange(1 << 16, dtype=np.uint16).view(np.float16)
+    with np.errstate(invalid="ignore"):
+        srgb_values = np.clip(half_values.astype(np.float32) ** 2.2, 0, 1)
+    return (np.nan_to_num(srgb_values) * 255).astype(np.uint8)
+
+
+LINEAR_TO_SRGB_LUT = build_linear_to_srgb_lut()
+
+
 def linear_to_srgb(pixels: np.ndarray) -> np.ndarray:
-    return np.clip(pixels**2.2, 0, 1)
+    # An 8-bit output can't resolve more than float16 precision, so quantize and look up
+    # the result instead of evaluating a power function per pixel.
+    # Values beyond float16's range become inf, which the table already maps to 255.
+    with np.errstate(over="ignore"):
+        half_pixels = pixels.astype(np.float16, copy=False)
+    return LINEAR_TO_SRGB_LUT[half_pixels.view(np.uint16)]
+
+
+def clean_name(name: str) -> str:
+    return UNSAFE_FILENAME_CHARS.sub("_", name)
+
+
+def scale_to_uint8(pixels: np.ndarray) -> np.ndarray:
+    """Maps [0, 1] pixels to uint8, using `pixels` as scratch space.
 
+    The clip writes straight into the uint8 output, so the cast needs no extra pass.
+    """
+    np.multiply(pixels, 255, out=pixels)
+    normalized_pixels = np.empty(pixels.shape, dtype=np.uint8)
+    np.clip(pixels, 0, 255, out=normalized_pixels, casting="unsafe")
+    return normalized_pixels
 
-def write_channel(layer: ExrLayer, channel: ExrChannel, exr_path: Path) -> None:
+
+def write_channel(
+    layer: ExrLayer, clean_layer_name: str, channel: ExrChannel, exr_path: Path
+) -> None:
     layer_name = layer.name or "unknown_layer"
-    clean_layer_name = re.sub(r"[^a-zA-Z0-9]+", "_", layer_name)
     channel_name = channel.name or "unknown_channel"
-    clean_channel_name = re.sub(r"[^a-zA-Z0-9]+", "_", channel_name)
+    clean_channel_name = clean_name(channel_name)
     channel_path = exr_path.with_suffix(".png")
     channel_path = channel_path.with_stem(
         f"{channel_path.stem}_{clean_layer_name}_{clean_channel_name}"
     )
-    channel_pixels = channel.pixels.astype(np.float32)
-    max_pixel_value = np.max(channel_pixels)
-    min_pixel_value = np.min(channel_pixels)
+    # HALF channels are already precise enough for an 8-bit preview, so only widen uint32.
+    if channel.pixels.dtype == np.float16:
+        channel_pixels = channel.pixels.copy()
+    else:
+        channel_pixels = channel.pixels.astype(np.float32)
+    min_pixel_value, max_pixel_value = channel_pixels.min(), channel_pixels.max()
     if min_pixel_value >= -0.1 and max_pixel_value <= 1:
-        normalized_pixels = channel_pixels * 255
-        normalized_pixels = normalized_pixels.clip(0, 255).astype(np.uint8)
+        normalized_pixels = scale_to_uint8(channel_pixels)
     else:
         # It's probably linear, so we need to do a rough gamma correction.
         normalized_pixels = linear_to_srgb(channel_pixels)
-        normalized_pixels = (normalized_pixels * 255).clip(0, 255).astype(np.uint8)
 
     print(f"Saving channel {channel_name} in {layer_name} to {channel_path}...")
     channel_image = PIL.Image.fromarray(normalized_pixels)
-    channel_image.save(channel_path)
+    # These are debug previews, so favor encode speed over file size.
+    channel_image.save(channel_path, format="PNG", compress_level=1)
+
+
+def try_write_channel(
+    layer: ExrLayer, clean_layer_name: str, channel: ExrChannel, exr_path: Path
+) -> None:
+    try:
+        write_channel(layer, clean_layer_name, channel, exr_path)
+    except Exception as e:
+        stacktrace = traceback.format_exc()
+        print(f"Error writing channel {channel.name} in {layer.name}: {e}")
+        print(f"Stack trace: {stacktrace}")
 
 
 def run_example(example_exr_path: Path) -> None:
@@ -81,42 +130,46 @@ def run_example(example_exr_path: Path) -> None:
     }
 
     for layer in image.layers:
+        channels_metadata = []
+        for channel in layer.channels:
+            pixels = channel.pixels
+            channels_metadata.append(
+                {
+                    "name": channel.name,
+                    "dtype": pixels.dtype.name,
+                    "shape": str(pixels.shape),
+                }
+            )
+
         metadata["layers"].append(
             {
                 "name": layer.name,
                 "width": layer.width,
                 "height": layer.height,
                 "attributes": layer.attributes,
-                "channels": [
-                    {
-                        "name": channel.name,
-                        "dtype": str(channel.pixels.dtype),
-                        "shape": str(channel.pixels.shape),
-                    }
-                    for channel in layer.channels
-                ],
+                "channels": channels_metadata,
             }
         )
 
     print(f"Saving metadata to {metadata_path}...")
-    with open(metadata_path, "w") as file:
-        json.dump(metadata, file, indent=2)
+    # json.dump issues one write per token; serialize up front and write once instead.
+    metadata_path.write_text(json.dumps(metadata, indent=2))
 
+    # Examples already run one per process, so channels are written serially here to
+    # avoid nesting a thread pool inside every worker.
     for layer in image.layers:
+        # Every channel in a layer shares the same sanitized layer name.
+        clean_layer_name = clean_name(layer.name or "unknown_layer")
         for channel in layer.channels:
-            try:
-                write_channel(layer, channel, example_exr_path)
-            except Exception as e:
-                stacktrace = traceback.format_exc()
-                print(f"Error writing channel {channel.name} in {layer.name}: {e}")
-                print(f"Stack trace: {stacktrace}")
+            try_write_channel(layer, clean_layer_name, channel, example_exr_path)
 
     print(f"Done with example {example_exr_path}")
 
 
 def run_all_examples() -> None:
-    for example_exr_path in EXAMPLES_DATA_PATH.rglob("*.exr"):
-        run_example(example_exr_path)
+    # Each example is independent, so decode and encode them across all cores.
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(run_example, EXAMPLES_DATA_PATH.rglob("*.exr")))
 
 
 if __name__ == "__main__":
@@ -14,17 +14,21 @@ use numpy::{
 use pyo3::{
     exceptions::PyIOError,
     pyclass, pymethods, pymodule,
-    types::{PyAnyMethods, PyBytes, PyDict, PyDictMethods, PyModule, PyModuleMethods},
+    types::{
+        PyAnyMethods, PyByteArray, PyByteArrayMethods, PyBytes, PyBytesMethods, PyDict,
+        PyDictMethods, PyModule, PyModuleMethods,
+    },
     Bound, FromPyObject, Py, PyAny, PyErr, PyObject, PyResult, Python,
 };
-use std::io::{self, BufWriter, Cursor, Write};
+use std::io::{self, Cursor, Write};
+use std::path::PathBuf;
 use std::vec::Vec;
 
-fn get_inmemory_writer() -> BufWriter<Cursor<Vec<u8>>> {
-    let buffer = Vec::new();
-    let cursor = Cursor::new(buffer);
+fn get_inmemory_writer(capacity: usize) -> Cursor<Vec<u8>> {
+    // The cursor already writes straight into memory, so a BufWriter would only add a copy.
+    let buffer = Vec::with_capacity(capacity);
 
-    BufWriter::new(cursor)
+    Cursor::new(buffer)
 }
 
 mod pyattributes;
@@ -44,17 +48,32 @@ fn get_image_reader() -> ReadImage<fn(f64), ReadAllLayers<ReadAnyChannels<ReadFl
     image
 }
 
-fn vec_to_numpy_array<'py>(py: Python<'py>, array_data: &PixelData) -> Bound<'py, PyAny> {
+fn vec_to_numpy_array<'py>(
+    py: Python<'py>,
+    array_data: &PixelData,
+    height: usize,
+    width: usize,
+) -> PyResult<Bound<'py, PyAny>> {
+    let shape = [height, width];
     match array_data {
-        PixelData::F32(vec) => {
-            PyArray1::from_iter(py, vec.iter().map(|value| *value as f32)).into_any()
-        }
-        PixelData::F16(vec) => {
-            PyArray1::from_iter(py, vec.iter().map(|value| *value as f16)).into_any()
-        }
-        PixelData::U32(vec) => {
-            PyArray1::from_iter(py, vec.iter().map(|value| *value as u32)).into_any()
-        }
+        PixelData::F32(vec) => Ok(PyArray1::from_slice(py, vec).reshape(shape)?.into_any()),
+        PixelData::F16(vec) => Ok(PyArray1::from_slice(py, vec).reshape(shape)?.into_any()),
+        PixelData::U32(vec) => Ok(PyArray1::from_slice(py, vec).reshape(shape)?.into_any()),
+    }
+}
+
+fn pixel_data_into_numpy_array<'py>(
+    py: Python<'py>,
+    array_data: PixelData,
+    height: usize,
+    width: usize,
+) -> PyResult<Bound<'py, PyAny>> {
+    // numpy takes ownership of the decoded samples, so nothing is copied.
+    let shape = [height, width];
+    match array_data {
+        PixelData::F32(vec) => Ok(PyArray1::from_vec(py, vec).reshape(shape)?.into_any()),
+        PixelData::F16(vec) => Ok(PyArray1::from_vec(py, vec).reshape(shape)?.into_any()),
+        PixelData::U32(vec) => Ok(PyArray1::from_vec(py, vec).reshape(shape)?.into_any()),
     }
 }
 
@@ -69,8 +88,9 @@ fn to_rust_layer(layer: &ExrLayer) -> Option<Layer<AnyChannels<FlatSamples>>> {
         None => return None,
     };
 
+    // Borrow the samples; each channel below is copied exactly once into the exr writer.
     let pixels = match &layer.pixels {
-        Some(pixels) => pixels.clone(),
+        Some(pixels) => pixels,
         None => return None,
     };
 
@@ -130,31 +150,37 @@ struct ExrLayer {
 fn layer_from_exr(exr_layer: Layer<AnyChannels<FlatSamples>>) -> ExrLayer {
     let attributes = attributes_from_layer(&exr_layer.attributes);
     let name = exr_layer.attributes.layer_name.map(|name| name.to_string());
-    let channels = exr_layer
-        .channel_data
-        .list
-        .iter()
-        .map(|channel| channel.name.to_string())
-        .collect();
-    let pixels = Some(
-        exr_layer
-            .channel_data
-            .list
-            .iter()
-            .map(|channel| match &channel.sample_data {
-                FlatSamples::F32(vec) => PixelData::F32(vec.clone()),
-                FlatSamples::F16(vec) => PixelData::F16(vec.clone()),
-                FlatSamples::U32(vec) => PixelData::U32(vec.clone()),
-            })
-            .collect(),
-    );
+    let size = exr_layer.size;
+
+    // The decoded layer is owned, so move each channel's samples instead of cloning them.
+    let channel_count = exr_layer.channel_data.list.len();
+    let mut channels = Vec::with_capacity(channel_count);
+    let mut pixels = Vec::with_capacity(channel_count);
+    for channel in exr_layer.channel_data.list {
+        channels.push(channel.name.to_string());
+        pixels.push(match channel.sample_data {
+            FlatSamples::F32(vec) => PixelData::F32(vec),
+            FlatSamples::F16(vec) => PixelData::F16(vec),
+            FlatSamples::U32(vec) => PixelData::U32(vec),
+        });
+    }
 
     ExrLayer {
         name,
         channels,
-        width: Some(exr_layer.size.0),
-        height: Some(exr_layer.size.1),
-        pixels,
+        width: Some(size.0),
+        height: Some(size.1),
+        pixels: Some(pixels),
+        attributes,
+    }
+}
+
+fn image_from_exr(
+    attributes: ImageAttributes,
+    exr_layers: impl IntoIterator<Item = Layer<AnyChannels<FlatSamples>>>,
+) -> ExrImage {
+    ExrImage {
+        layers: exr_layers.into_iter().map(layer_from_exr).collect(),
         attributes,
     }
 }
@@ -166,6 +192,16 @@ enum PixelData {
     U32(Vec<u32>),
 }
 
+impl PixelData {
+    fn byte_len(&self) -> usize {
+        match self {
+            PixelData::F32(vec) => vec.len() * std::mem::size_of::<f32>(),
+            PixelData::F16(vec) => vec.len() * std::mem::size_of::<f16>(),
+            PixelData::U32(vec) => vec.len() * std::mem::size_of::<u32>(),
+        }
+    }
+}
+
 fn _validate_width_height_pixels(
     width_option: Option<usize>,
     height_option: Option<usize>,
@@ -196,14 +232,15 @@ fn _validate_width_height_pixels(
 }
 
 fn convert_numpy_array<'py>(py: Python<'py>, array: &Bound<'py, PyAny>) -> PyResult<PixelData> {
-    if let Ok(array) = array.extract::<PyReadonlyArray1<f32>>() {
-        return Ok(PixelData::F32(array.to_vec()?));
+    // try_readonly surfaces a conflicting mutable borrow as a Python error, not a panic.
+    if let Ok(array) = array.downcast::<PyArray1<f32>>() {
+        return Ok(PixelData::F32(array.try_readonly()?.to_vec()?));
     }
-    if let Ok(array) = array.extract::<PyReadonlyArray1<f16>>() {
-        return Ok(PixelData::F16(array.to_vec()?));
+    if let Ok(array) = array.downcast::<PyArray1<f16>>() {
+        return Ok(PixelData::F16(array.try_readonly()?.to_vec()?));
     }
-    if let Ok(array) = array.extract::<PyReadonlyArray1<u32>>() {
-        return Ok(PixelData::U32(array.to_vec()?));
+    if let Ok(array) = array.downcast::<PyArray1<u32>>() {
+        return Ok(PixelData::U32(array.try_readonly()?.to_vec()?));
     }
 
     Err(PyErr::new::<pyo3::exceptions::PyTypeError, _>(
@@ -251,14 +288,45 @@ impl ExrLayer {
     }
 
     fn pixels<'py>(&self, py: Python<'py>) -> PyResult<Option<Vec<Bound<'py, PyAny>>>> {
-        let pixels = self.pixels.clone().map(|channels| {
-            channels
-                .iter()
-                .map(|channel| vec_to_numpy_array(py, channel))
-                .collect()
-        });
+        let (channels, width, height) = match (&self.pixels, self.width, self.height) {
+            (Some(channels), Some(width), Some(height)) => (channels, width, height),
+            _ => return Ok(None),
+        };
+
+        // Arrays come back already shaped (height, width) so Python needs no reshape.
+        let pixels = channels
+            .iter()
+            .map(|channel| vec_to_numpy_array(py, channel, height, width))
+            .collect::<PyResult<Vec<_>>>()?;
+
+        Ok(Some(pixels))
+    }
+
+    fn take_channels_with_pixels<'py>(
+        &mut self,
+        py: Python<'py>,
+    ) -> PyResult<Option<Vec<(String, Bound<'py, PyAny>)>>> {
+        let (width, height) = match (&self.pixels, self.width, self.height) {
+            (Some(_), Some(width), Some(height)) => (width, height),
+            _ => return Ok(None),
+        };
+
+        // Move names and samples out of the layer so numpy can adopt the buffers as-is,
+        // and pair them here so Python gets every channel from a single call.
+        let channels = std::mem::take(&mut self.channels);
+        let pixels = self.pixels.take().unwrap_or_default();
+        let pixels = channels
+            .into_iter()
+            .zip(pixels)
+            .map(|(name, channel)| {
+                Ok((
+                    name,
+                    pixel_data_into_numpy_array(py, channel, height, width)?,
+                ))
+            })
+            .collect::<PyResult<Vec<_>>>()?;
 
-        Ok(pixels)
+        Ok(Some(pixels))
     }
 
     fn with_channel<'py>(
@@ -283,6 +351,19 @@ impl ExrLayer {
         Ok(())
     }
 
+    fn with_channels<'py>(
+        &mut self,
+        py: Python<'py>,
+        channels: Vec<(String, Bound<'py, PyAny>)>,
+    ) -> PyResult<()> {
+        // Lets Python hand over every channel of a layer in a single call.
+        for (channel, pixels) in channels {
+            self.with_channel(py, channel, &pixels)?;
+        }
+
+        Ok(())
+    }
+
     fn attributes<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
         pyattributes::pydict_from_attributes(py, &self.attributes)
     }
@@ -333,56 +414,92 @@ impl ExrImage {
         self.layers.clone()
     }
 
+    fn take_layers(&mut self) -> Vec<ExrLayer> {
+        std::mem::take(&mut self.layers)
+    }
+
     fn with_layer(&mut self, layer: ExrLayer) {
         self.layers.push(layer);
     }
 
     fn save_to_buffer<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyBytes>> {
-        let first_layer = self.layers.first().unwrap();
-        let rust_layers: Vec<Layer<AnyChannels<FlatSamples>>> = self
-            .layers
-            .iter()
-            .flat_map(|layer| to_rust_layer(layer))
-            .collect();
-
-        let mut attributes = self.attributes.clone();
-        attributes.display_window.size.0 = first_layer.width.unwrap();
-        attributes.display_window.size.1 = first_layer.height.unwrap();
-
-        let image = Image::from_layers(attributes, rust_layers);
-        let mut writer = get_inmemory_writer();
-        match image.write().to_buffered(&mut writer) {
-            Ok(_) => (),
-            Err(e) => return Err(PyIOError::new_err(e.to_string())),
-        }
+        // Encoding only touches Rust-owned data, so let other Python threads run meanwhile.
+        let buffer = py.allow_threads(|| write_image_to_vec(self))?;
+        Ok(PyBytes::new(py, buffer.as_slice()))
+    }
 
-        match writer.into_inner() {
-            Ok(buffer) => Ok(PyBytes::new(py, buffer.into_inner().as_slice())),
-            Err(e) => Err(PyIOError::new_err(e.to_string())),
+    #[staticmethod]
+    fn load_from_buffer<'py>(py: Python<'py>, buffer: &Bound<'py, PyAny>) -> PyResult<ExrImage> {
+        // Decode bytes and bytearrays in place rather than copying them into Rust first.
+        if let Ok(bytes) = buffer.downcast::<PyBytes>() {
+            // bytes are immutable, so the slice stays valid with the GIL released.
+            let bytes = bytes.as_bytes();
+            py.allow_threads(|| read_image_from_bytes(bytes))
+        } else if let Ok(bytearray) = buffer.downcast::<PyByteArray>() {
+            // Sound because the GIL stays held and no Python code runs while decoding. A
+            // bytearray can be resized by other threads, so it can't be decoded without it.
+            read_image_from_bytes(unsafe { bytearray.as_bytes() })
+        } else {
+            Err(PyErr::new::<pyo3::exceptions::PyTypeError, _>(
+                "Expected bytes or bytearray",
+            ))
         }
     }
 
     #[staticmethod]
-    fn load_from_buffer<'py>(py: Python<'py>, buffer: &Bound<'py, PyBytes>) -> PyResult<ExrImage> {
-        let bytes: &[u8] = buffer.extract::<&[u8]>()?;
-        let cursor = Cursor::new(bytes);
-        let image = match get_image_reader().from_buffered(cursor) {
-            Ok(image) => image,
-            Err(e) => return Err(PyIOError::new_err(e.to_string())),
-        };
+    fn load_from_path(py: Python<'_>, path: PathBuf) -> PyResult<ExrImage> {
+        py.allow_threads(|| {
+            // One bulk read up front, then decode from memory like load_from_buffer does,
+            // rather than streaming every chunk through small buffered reads. `?` keeps the
+            // io::ErrorKind, so Python sees FileNotFoundError, PermissionError, etc.
+            let bytes = std::fs::read(path)?;
+
+            read_image_from_bytes(&bytes)
+        })
+    }
+}
 
-        let mut layers: Vec<ExrLayer> = Vec::new();
-        for layer in image.layer_data {
-            layers.push(layer_from_exr(layer));
-        }
+fn write_image_to_vec(exr_image: &ExrImage) -> PyResult<Vec<u8>> {
+    let first_layer = exr_image.layers.first().unwrap();
+    let rust_layers: Vec<Layer<AnyChannels<FlatSamples>>> = exr_image
+        .layers
+        .iter()
+        .flat_map(|layer| to_rust_layer(layer))
+        .collect();
 
-        Ok(ExrImage {
-            layers,
-            attributes: image.attributes,
-        })
+    let mut attributes = exr_image.attributes.clone();
+    attributes.display_window.size.0 = first_layer.width.unwrap();
+    attributes.display_window.size.1 = first_layer.height.unwrap();
+
+    // Start from a fraction of the raw sample size. That covers typical PIZ output with
+    // few or no reallocations, without committing a full raw-sized buffer on platforms
+    // that don't map large allocations lazily. Incompressible data just regrows the Vec.
+    let raw_len: usize = exr_image
+        .layers
+        .iter()
+        .flat_map(|layer| layer.pixels.iter().flatten())
+        .map(PixelData::byte_len)
+        .sum();
+    let capacity = raw_len / 4;
+
+    let image = Image::from_layers(attributes, rust_layers);
+    let mut writer = get_inmemory_writer(capacity);
+    match image.write().to_buffered(&mut writer) {
+        Ok(_) => Ok(writer.into_inner()),
+        Err(e) => Err(PyIOError::new_err(e.to_string())),
     }
 }
 
+fn read_image_from_bytes(bytes: &[u8]) -> PyResult<ExrImage> {
+    let cursor = Cursor::new(bytes);
+    let image = match get_image_reader().from_buffered(cursor) {
+        Ok(image) => image,
+        Err(e) => return Err(PyIOError::new_err(e.to_string())),
+    };
+
+    Ok(image_from_exr(image.attributes, image.layer_data))
+}
+
 #[pymodule]
 #[pyo3(name = "_rust")]
 fn exrio<'py>(m: &Bound<'py, PyModule>) -> PyResult<()> {
@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import Any, Callable, Optional, Union
 
 import numpy as np
 from numpy.typing import NDArray
@@ -13,14 +13,8 @@ from exrio._rust import ExrLayer as RustLayer
 
 ACES_IMAGE_CONTAINER_FLAG = "acesImageContainerFlag"
 EXRIO_COLORSPACE_KEY = "py/exrio/Colorspace"
-
-
-def _pixels_from_layer(layer: RustLayer) -> list[NDArray[Any]]:
-    pixels = layer.pixels()
-    assert pixels is not None
-    return [
-        pixels[i].reshape(layer.height(), layer.width()) for i in range(len(pixels))
-    ]
+FLOAT_DTYPES = frozenset([np.dtype(np.float16), np.dtype(np.float32)])
+CHANNEL_DTYPES = FLOAT_DTYPES | {np.dtype(np.uint32)}
 
 
 class Colorspace(str, Enum):
@@ -99,26 +93,30 @@ PRIMARY_CHROMATICITIES = {
         white=(0.3127, 0.329),
     ),
 }
+_AP0_CHROMATICITIES = PRIMARY_CHROMATICITIES["AP0"]
+_AP1_CHROMATICITIES = PRIMARY_CHROMATICITIES["AP1"]
+_SRGB_CHROMATICITIES = PRIMARY_CHROMATICITIES["sRGB"]
+# Rows line up with the sRGB/AP0/AP1 checks in ExrImage.inferred_colorspace.
+_INFERRABLE_CHROMATICITIES = np.array(
+    [
+        _SRGB_CHROMATICITIES.to_list(),
+        _AP0_CHROMATICITIES.to_list(),
+        _AP1_CHROMATICITIES.to_list(),
+    ]
+)
 
 
 @dataclass
 class ExrChannel:
+    # `dataclass(slots=True)` needs Python 3.10, and hand-written slots clash with
+    # field defaults, so only the default-free (and most numerous) class gets them.
+    __slots__ = ("name", "width", "height", "pixels")
+
     name: str
     width: int
     height: int
     pixels: NDArray[Any]
 
-    @staticmethod
-    def _from_rust(
-        name: str, width: int, height: int, pixels: NDArray[Any]
-    ) -> "ExrChannel":
-        return ExrChannel(
-            name=name,
-            width=width,
-            height=height,
-            pixels=pixels,
-        )
-
 
 @dataclass
 class ExrLayer:
@@ -139,28 +137,41 @@ class ExrLayer:
         return channel_names == {"L"} or channel_names == {"A"}
 
     def _to_rust(self) -> RustLayer:
+        dtypes = {channel.pixels.dtype for channel in self.channels}
+        debug_msg = f"expected float16, float32, or uint32, got {dtypes}"
+        assert dtypes <= CHANNEL_DTYPES, debug_msg
+
         layer = RustLayer(name=self.name)
         layer.with_width(self.width)
         layer.with_height(self.height)
         layer.with_attributes(self.attributes)
-        for channel in self.channels:
-            assert channel.pixels.dtype in [np.float16, np.float32, np.uint32]
-            pixels = channel.pixels.flatten()
-            layer.with_channel(channel=channel.name, pixels=pixels.copy(order="C"))
+        # ravel() returns a view for contiguous pixels and only copies otherwise.
+        layer.with_channels(
+            [
+                (channel.name, channel.pixels.ravel(order="C"))
+                for channel in self.channels
+            ]
+        )
         return layer
 
-    def to_pixels(self) -> NDArray[Any]:
+    def to_pixels(self, out: Optional[NDArray[Any]] = None) -> NDArray[Any]:
+        """
+        Returns a HWC L/RGB/RGBA image for the layer, written into `out` if provided.
+        """
+        if self.is_mask_like:
+            # Mask-like layers always have a channel, so the plane is just a reshaped view.
+            pixels = self.channels[0].pixels.reshape(self.height, self.width, 1)
+            if out is None:
+                return pixels
+            out[...] = pixels
+            return out
+
         channel_names = set([c.name for c in self.channels])
         channel_pixels = {
             channel.name: channel.pixels.reshape(self.height, self.width)
             for channel in self.channels
         }
 
-        if self.is_mask_like:
-            empty_pixels = np.zeros((self.height, self.width))
-            pixels = next(iter(channel_pixels.values()), empty_pixels)
-            return pixels.reshape(self.height, self.width, 1)
-
         rgb_pixels = []
         for channel in ["R", "G", "B"]:
             assert (
@@ -171,7 +182,13 @@ class ExrLayer:
         if "A" in channel_names:
             rgb_pixels.append(channel_pixels["A"])
 
-        return np.stack(rgb_pixels, axis=-1)
+        # Interleave each plane straight into the HWC output, one pass per channel.
+        if out is None:
+            dtype = np.result_type(*rgb_pixels)
+            out = np.empty((self.height, self.width, len(rgb_pixels)), dtype=dtype)
+        for idx, plane in enumerate(rgb_pixels):
+            out[..., idx] = plane
+        return out
 
     @staticmethod
     def _from_rust(rust_layer: RustLayer) -> "ExrLayer":
@@ -181,15 +198,12 @@ class ExrLayer:
         height = rust_layer.height()
         assert height is not None
 
-        channel_names = rust_layer.channels()
-        channel_pixels = _pixels_from_layer(rust_layer)
-        assert len(channel_names) == len(
-            channel_pixels
-        ), f"expected {len(channel_names)} channels, got {len(channel_pixels)}"
+        channel_pixels = rust_layer.take_channels_with_pixels()
+        assert channel_pixels is not None
 
         channels = [
-            ExrChannel._from_rust(channel, width, height, pixels)
-            for channel, pixels in zip(channel_names, channel_pixels)
+            ExrChannel(name=channel, width=width, height=height, pixels=pixels)
+            for channel, pixels in channel_pixels
         ]
 
         return ExrLayer(
@@ -230,14 +244,18 @@ class ExrImage:
         if self.chromaticities is None:
             return None
 
-        if self.chromaticities.is_close_to(PRIMARY_CHROMATICITIES["sRGB"]):
+        # Compare against every known set of primaries in one vectorized pass.
+        is_srgb, is_ap0, is_ap1 = np.isclose(
+            _INFERRABLE_CHROMATICITIES, self.chromaticities.to_list(), atol=1e-3
+        ).all(axis=1)
+        if is_srgb:
             # We can't easily determine if the image is sRGB or LinearRGB,
             # so we'll default to the more common sRGB.
             return Colorspace.sRGB
-        elif self.chromaticities.is_close_to(PRIMARY_CHROMATICITIES["AP0"]):
+        elif is_ap0:
             # Thankfully, ACES2065-1 is the only supported colorspace that uses the AP0 primaries.
             return Colorspace.ACES
-        elif self.chromaticities.is_close_to(PRIMARY_CHROMATICITIES["AP1"]):
+        elif is_ap1:
             if not self.first_layer:
                 return None
 
@@ -295,8 +313,16 @@ class ExrImage:
             and len(layer.channels) == channel_count
         ]
 
-        pixels = [layer.to_pixels() for layer in matching_layers]
-        return np.stack(pixels, axis=0)
+        # Fill each frame of the NHWC output in place instead of stacking per-layer copies.
+        dtype = np.result_type(
+            *[channel.pixels for layer in matching_layers for channel in layer.channels]
+        )
+        pixels = np.empty(
+            (len(matching_layers), height, width, channel_count), dtype=dtype
+        )
+        for frame_idx, layer in enumerate(matching_layers):
+            layer.to_pixels(out=pixels[frame_idx])
+        return pixels
 
     def _to_rust(self) -> RustImage:
         image = RustImage()
@@ -318,22 +344,23 @@ class ExrImage:
         if chromaticities is not None:
             chromaticities = Chromaticities._from_rust(chromaticities)
         return ExrImage(
-            layers=[ExrLayer._from_rust(layer) for layer in rust_image.layers()],
+            layers=[ExrLayer._from_rust(layer) for layer in rust_image.take_layers()],
             attributes=attributes,
             chromaticities=chromaticities,
         )
 
     @staticmethod
-    def from_buffer(buffer: Union[BytesIO, bytes]) -> "ExrImage":
+    def from_buffer(buffer: Union[BytesIO, bytes, bytearray]) -> "ExrImage":
         if isinstance(buffer, BytesIO):
+            # CPython hands back its internal bytes object here without copying, and
+            # immutable bytes let Rust decode without the GIL. The abi3 extension can't
+            # borrow a getbuffer() memoryview, since the buffer protocol needs 3.11+.
             buffer = buffer.getvalue()
         return ExrImage._from_rust(RustImage.load_from_buffer(buffer))
 
     @staticmethod
     def from_path(path: Union[str, Path]) -> "ExrImage":
-        with open(path, "rb") as file:
-            buffer = BytesIO(file.read())
-            return ExrImage.from_buffer(buffer)
+        return ExrImage._from_rust(RustImage.load_from_path(str(path)))
 
     @staticmethod
     def _from_pixels(
@@ -350,23 +377,28 @@ class ExrImage:
             assert len(layer_names) == pixels.shape[0]
 
         debug_msg = f"expected float16, float32, or uint32, got {pixels.dtype}"
-        assert pixels.dtype in [np.float16, np.float32, np.uint32], debug_msg
+        assert pixels.dtype in CHANNEL_DTYPES, debug_msg
 
         frames, height, width, channel_count = pixels.shape
         debug_msg = f"expected 1, 3, or 4 channels, got {channel_count}"
         assert channel_count in [1, 3, 4], debug_msg
 
+        # Deinterleave NHWC into contiguous (H, W) planes in a single pass over the whole
+        # batch, rather than leaving each channel as a strided view that gets gathered
+        # again on save.
+        planes = np.ascontiguousarray(np.moveaxis(pixels, -1, 1))
+        channel_names = "L" if channel_count == 1 else "RGBA"[:channel_count]
+
         layers: list[ExrLayer] = []
         for frame_idx in range(frames):
             channels: list[ExrChannel] = []
-            channel_names = "L" if channel_count == 1 else "RGBA"[:channel_count]
             for idx, channel_name in enumerate(channel_names):
                 channels.append(
                     ExrChannel(
                         name=channel_name,
                         width=width,
                         height=height,
-                        pixels=pixels[frame_idx, ..., idx],
+                        pixels=planes[frame_idx, idx],
                     )
                 )
             layers.append(
@@ -392,10 +424,8 @@ class ExrImage:
 
         @see https://pub.smpte.org/pub/st2065-1/st2065-1-2021.pdf
         """
-        assert pixels.dtype in [np.float16, np.float32]
-        image = ExrImage._from_pixels(
-            pixels, PRIMARY_CHROMATICITIES["AP0"], layer_names
-        )
+        assert pixels.dtype in FLOAT_DTYPES
+        image = ExrImage._from_pixels(pixels, _AP0_CHROMATICITIES, layer_names)
         image.attributes[ACES_IMAGE_CONTAINER_FLAG] = 1
         image.attributes[EXRIO_COLORSPACE_KEY] = Colorspace.ACES
         return image
@@ -412,10 +442,8 @@ class ExrImage:
 
         @see https://docs.acescentral.com/specifications/acescg/
         """
-        assert pixels.dtype in [np.float16, np.float32]
-        image = ExrImage._from_pixels(
-            pixels, PRIMARY_CHROMATICITIES["AP1"], layer_names
-        )
+        assert pixels.dtype in FLOAT_DTYPES
+        image = ExrImage._from_pixels(pixels, _AP1_CHROMATICITIES, layer_names)
         image.attributes[EXRIO_COLORSPACE_KEY] = Colorspace.ACEScg
         return image
 
@@ -431,10 +459,8 @@ class ExrImage:
 
         @see https://docs.acescentral.com/specifications/acescc/
         """
-        assert pixels.dtype in [np.float16, np.float32]
-        image = ExrImage._from_pixels(
-            pixels, PRIMARY_CHROMATICITIES["AP1"], layer_names
-        )
+        assert pixels.dtype in FLOAT_DTYPES
+        image = ExrImage._from_pixels(pixels, _AP1_CHROMATICITIES, layer_names)
         image.attributes[EXRIO_COLORSPACE_KEY] = Colorspace.ACEScc
         return image
 
@@ -450,10 +476,8 @@ class ExrImage:
 
         @see https://docs.acescentral.com/specifications/acescct/
         """
-        assert pixels.dtype in [np.float16, np.float32]
-        image = ExrImage._from_pixels(
-            pixels, PRIMARY_CHROMATICITIES["AP1"], layer_names
-        )
+        assert pixels.dtype in FLOAT_DTYPES
+        image = ExrImage._from_pixels(pixels, _AP1_CHROMATICITIES, layer_names)
         image.attributes[EXRIO_COLORSPACE_KEY] = Colorspace.ACEScct
         return image
 
@@ -470,10 +494,9 @@ class ExrImage:
         @see https://www.color.org/chardata/rgb/srgb.xalter
         """
         if pixels.dtype == np.uint8:
-            pixels = pixels.astype(np.float16) / 255.0
-        image = ExrImage._from_pixels(
-            pixels, PRIMARY_CHROMATICITIES["sRGB"], layer_names
-        )
+            # Cast and normalize in one pass without a uint8-sized float16 temporary.
+            pixels = np.divide(pixels, 255, dtype=np.float16)
+        image = ExrImage._from_pixels(pixels, _SRGB_CHROMATICITIES, layer_names)
         image.attributes[EXRIO_COLORSPACE_KEY] = Colorspace.sRGB
         return image
 
@@ -489,10 +512,8 @@ class ExrImage:
 
         @see https://facelessuser.github.io/coloraide/colors/srgb_linear/
         """
-        assert pixels.dtype in [np.float16, np.float32]
-        image = ExrImage._from_pixels(
-            pixels, PRIMARY_CHROMATICITIES["sRGB"], layer_names
-        )
+        assert pixels.dtype in FLOAT_DTYPES
+        image = ExrImage._from_pixels(pixels, _SRGB_CHROMATICITIES, layer_names)
         image.attributes[EXRIO_COLORSPACE_KEY] = Colorspace.LinearRGB
         return image
 
@@ -502,28 +523,32 @@ class ExrImage:
         colorspace: Colorspace = Colorspace.sRGB,
         layer_names: Optional[list[str]] = None,
     ) -> "ExrImage":
-        if colorspace == Colorspace.ACES:
-            return ExrImage.from_pixels_ACES(pixels, layer_names)
-        elif colorspace == Colorspace.ACEScg:
-            return ExrImage.from_pixels_ACEScg(pixels, layer_names)
-        elif colorspace == Colorspace.ACEScct:
-            return ExrImage.from_pixels_ACEScct(pixels, layer_names)
-        elif colorspace == Colorspace.ACEScc:
-            return ExrImage.from_pixels_ACEScc(pixels, layer_names)
-        elif colorspace == Colorspace.sRGB:
-            return ExrImage.from_pixels_sRGB(pixels, layer_names)
-        elif colorspace == Colorspace.LinearRGB:
-            return ExrImage.from_pixels_LinearRGB(pixels, layer_names)
-        else:
+        from_pixels = _FROM_PIXELS_BY_COLORSPACE.get(colorspace)
+        if from_pixels is None:
             raise ValueError(f"Unsupported colorspace: {colorspace}")
+        return from_pixels(pixels, layer_names)
+
+
+_FROM_PIXELS_BY_COLORSPACE: dict[
+    Colorspace, Callable[[NDArray[Any], Optional[list[str]]], ExrImage]
+] = {
+    Colorspace.ACES: ExrImage.from_pixels_ACES,
+    Colorspace.ACEScg: ExrImage.from_pixels_ACEScg,
+    Colorspace.ACEScct: ExrImage.from_pixels_ACEScct,
+    Colorspace.ACEScc: ExrImage.from_pixels_ACEScc,
+    Colorspace.sRGB: ExrImage.from_pixels_sRGB,
+    Colorspace.LinearRGB: ExrImage.from_pixels_LinearRGB,
+}
 
 
-def load(path_or_buffer: Union[BytesIO, bytes, str, Path, NDArray[Any]]) -> ExrImage:
+def load(
+    path_or_buffer: Union[BytesIO, bytes, bytearray, str, Path, NDArray[Any]],
+) -> ExrImage:
     if isinstance(path_or_buffer, np.ndarray):
         return ExrImage.from_pixels(path_or_buffer)
-    elif isinstance(path_or_buffer, str) or isinstance(path_or_buffer, Path):
+    elif isinstance(path_or_buffer, (str, Path)):
         return ExrImage.from_path(path_or_buffer)
-    elif isinstance(path_or_buffer, bytes) or isinstance(path_or_buffer, BytesIO):
+    elif isinstance(path_or_buffer, (bytes, bytearray, BytesIO)):
         return ExrImage.from_buffer(path_or_buffer)
     else:
         raise ValueError(f"Unsupported type: {type(path_or_buffer)}")
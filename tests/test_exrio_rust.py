@@ -57,4 +57,5 @@ def test_basic_exr_roundtrip_buffer():
     assert read_layer.height() == 2
 
     read_red_channel = read_layer.pixels()[2]  # Saved as BGR, not RGB
-    np.testing.assert_array_almost_equal(read_red_channel, r_channel.reshape(-1))
+    assert read_red_channel.shape == (2, 2)
+    np.testing.assert_array_almost_equal(read_red_channel, r_channel)
@@ -1,7 +1,9 @@
+import pickle
 import tempfile
 from typing import Any, Optional
 
 import numpy as np
+import pytest
 
 from exrio.image import Colorspace, ExrChannel, ExrImage, ExrLayer, load
 
@@ -9,8 +11,7 @@ from exrio.image import Colorspace, ExrChannel, ExrImage, ExrLayer, load
 def _create_image(
     pixels: np.ndarray[Any, Any], attributes: Optional[dict[str, str]] = None
 ) -> ExrImage:
-    width = pixels.shape[1]
-    height = pixels.shape[0]
+    height, width = pixels.shape[:2]
     channel = ExrChannel(name="testc", width=width, height=height, pixels=pixels)
     layer = ExrLayer(
         name="testl",
@@ -28,6 +29,11 @@ def test_load_from_path():
     assert image.layers[0].channels[0].pixels.dtype == np.float16
 
 
+def test_load_missing_path():
+    with pytest.raises(FileNotFoundError):
+        load("tests/fixtures/missing.exr")
+
+
 def test_roundtrip_f32():
     image = _create_image(np.zeros((256, 256), dtype=np.float32))
 
@@ -53,6 +59,36 @@ def test_roundtrip_u32():
     assert rt_image.layers[0].channels[0].pixels.shape == (320, 240)
 
 
+def test_roundtrip_bytearray():
+    image = _create_image(np.zeros((320, 240), dtype=np.float32))
+    buffer = bytearray(image.to_buffer())
+    rt_image = load(buffer)
+    assert rt_image.layers[0].channels[0].pixels.dtype == np.float32
+    assert rt_image.layers[0].channels[0].pixels.shape == (320, 240)
+
+
+def test_roundtrip_strided_pixels():
+    pixels = np.random.rand(320, 240, 3).astype(np.float32)[..., 1]
+    assert not pixels.flags.c_contiguous
+
+    image = _create_image(pixels)
+    buffer = image.to_buffer()
+    rt_image = load(buffer)
+    np.testing.assert_array_equal(rt_image.layers[0].channels[0].pixels, pixels)
+
+
+def test_pickle_channel_out_of_band():
+    pixels = np.zeros((320, 240), dtype=np.float32)
+    image = _create_image(pixels)
+
+    buffers: list[pickle.PickleBuffer] = []
+    data = pickle.dumps(image, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 1
+
+    rt_image = pickle.loads(data, buffers=buffers)
+    assert np.shares_memory(rt_image.layers[0].channels[0].pixels, pixels)
+
+
 def test_roundtrip_pixels():
     input_pixels = np.random.rand(320, 240, 3).astype(np.float32)
     image = load(input_pixels)
@@ -63,7 +99,7 @@ def test_roundtrip_pixels():
     assert output_pixels.shape == (1, 320, 240, 3)
     assert output_pixels.dtype == np.float32
 
-    np.testing.assert_allclose(output_pixels[0], input_pixels)
+    np.testing.assert_array_equal(output_pixels[0], input_pixels)
 
 
 def test_roundtrip_pixels_with_layers():
@@ -78,7 +114,7 @@ def test_roundtrip_pixels_with_layers():
     assert output_pixels.shape == (3, 320, 240, 3)
     assert output_pixels.dtype == np.float32
 
-    np.testing.assert_allclose(output_pixels, input_pixels)
+    np.testing.assert_array_equal(output_pixels, input_pixels)
 
 
 def test_roundtrip_pixels_with_layer_names():
@@ -100,7 +136,9 @@ def test_roundtrip_pixels_with_layer_names():
     for i, layer in enumerate(rt_image.layers):
         assert layer.channels[0].pixels.dtype == np.float32
         assert layer.channels[0].pixels.shape == (320, 240)
-        np.testing.assert_allclose(layer.channels[0].pixels, input_pixels[i, :, :, 0])
+        np.testing.assert_array_equal(
+            layer.channels[0].pixels, input_pixels[i, :, :, 0]
+        )
 
 
 def test_roundtrip_chromaticities():